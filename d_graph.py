@@ -6,6 +6,8 @@
 # add edge, get edges, perform BFS/DFS, etc.)
 
 import heapq
+from array import array
+from bisect import bisect_left
 from collections import deque
 
 class DirectedGraph:
@@ -17,6 +19,9 @@ class DirectedGraph:
     - vertex names are integers
     """
 
+    # GraphProbe collecting instrumentation from this graph, set by GraphProbe.attach() (see graph_probe)
+    _probe = None
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency matrix
@@ -188,6 +193,7 @@ class DirectedGraph:
         next_verts = []
         visited_verts = []
         next_verts.append(v_start)
+        pops = 0
 
         # check to make sure the start vert is in the graph
         if 0 <= v_start < self.v_count:
@@ -196,11 +202,12 @@ class DirectedGraph:
             while next_verts:
                 # pop the top vertex
                 src_vert = next_verts.pop()
+                pops += 1
 
-                # if the vertex that we're currently on is the ending vertex, end the function
+                # if the vertex that we're currently on is the ending vertex, end the search
                 if src_vert == v_end:
                     visited_verts.append(src_vert)
-                    return visited_verts
+                    break
 
                 if src_vert not in visited_verts:
                     # push all the destination verts that have an edge to the stack from the back index forward
@@ -209,6 +216,9 @@ class DirectedGraph:
                         if edge != 0:
                             next_verts.append(dst_vert)
                     visited_verts.append(src_vert)
+
+            if self._probe is not None:
+                self._report_search('dfs', visited_verts, pops, len(next_verts))
         return visited_verts
 
     def bfs(self, v_start, v_end=None) -> []:
@@ -223,6 +233,7 @@ class DirectedGraph:
         queue = deque()
         queue.append(v_start)
         visited_verts = []
+        pops = 0
 
         # check to make sure the starting vertex is in the graph
         if 0 <= v_start < self.v_count:
@@ -230,12 +241,13 @@ class DirectedGraph:
             while queue:
                 # dequeue the first vertex
                 src_vert = queue.popleft()
+                pops += 1
 
                 # check to see if you've reached the ending vertex, if you have append to the list of visited verts
-                # and end the function
+                # and end the search
                 if src_vert == v_end:
                     visited_verts.append(src_vert)
-                    return visited_verts
+                    break
 
                 if src_vert not in visited_verts:
                     for dst_vert in range(self.v_count):
@@ -243,6 +255,9 @@ class DirectedGraph:
                         if edge != 0:
                             queue.append(dst_vert)
                     visited_verts.append(src_vert)
+
+            if self._probe is not None:
+                self._report_search('bfs', visited_verts, pops, len(queue))
         return visited_verts
 
     def has_cycle(self):
@@ -291,10 +306,12 @@ class DirectedGraph:
             pqueue = []
             heapq.heappush(pqueue, (0, src))
             visited_verts = []
+            pops = 0
 
             # perform a BFS, but do so with a priority queue and reference to dst vertex and weight of edge
             while pqueue:
                 weight, src_vert = heapq.heappop(pqueue)
+                pops += 1
                 if src_vert not in visited_verts:
                     for dst_vert in range(self.v_count):
                         edge_weight = self.adj_matrix[src_vert][dst_vert]
@@ -303,8 +320,260 @@ class DirectedGraph:
                     return_list[src_vert] = weight
                     visited_verts.append(src_vert)
 
+            if self._probe is not None:
+                self._report_search('dijkstra', visited_verts, pops, 0)
             return return_list
 
+    def _report_search(self, method, visited_verts, pops, left_over):
+        """
+        Report the work counters of a search to the attached probe. Every entry pushed is either popped or still
+        left over when the search stops, and every push after the first one comes from following one edge, so the
+        counters are worked out here instead of being counted inside the search loops.
+        """
+        pushes = pops + left_over
+        self._probe.count(method, vertices_settled=len(visited_verts), edges_scanned=pushes - 1, pushes=pushes,
+                          pops=pops, stale_entries=pops - len(visited_verts))
+
+    def freeze(self):
+        """
+        This method returns an immutable snapshot of the graph as a FrozenDirectedGraph. The snapshot does not share
+        any storage with the graph, so the graph can keep being modified while other threads query the snapshot
+        without locks. Call this method from the thread that modifies the graph and publish the result by assigning
+        it to a shared variable (a single assignment is atomic, so readers see either the old or the new snapshot).
+        """
+        return FrozenDirectedGraph(self)
+
+
+class FrozenDirectedGraph:
+    """
+    Class to implement an immutable snapshot of a DirectedGraph
+    - created with DirectedGraph.freeze()
+    - adjacency stored as compressed rows in read-only arrays
+    - attributes cannot be reassigned after construction
+    - vertex names are integers
+    """
+
+    __slots__ = ('v_count', 'offsets', 'targets', 'weights')
+
+    def __init__(self, graph):
+        """
+        Build the compressed rows from the adjacency matrix of the input DirectedGraph. The out edges of vertex v
+        are stored at positions offsets[v] to offsets[v + 1] of targets (destination vertex) and weights (edge
+        weight), with the destination vertices in ascending order. Weights are kept in an array when they are all
+        integers, otherwise the weight objects are kept as they are in a tuple.
+        """
+        offsets = array('q', [0])
+        targets = array('q')
+        weight_list = []
+
+        # loop through every row of the matrix once, keeping only the cells that hold an edge
+        for row in graph.adj_matrix:
+            for dst, weight in enumerate(row):
+                if weight != 0:
+                    targets.append(dst)
+                    weight_list.append(weight)
+            offsets.append(len(targets))
+
+        # the snapshot must return the same weight objects as the graph, so only pack weights that are all integers
+        weights = tuple(weight_list)
+        if all(type(weight) is int for weight in weight_list):
+            try:
+                weights = memoryview(array('q', weight_list)).toreadonly()
+            except OverflowError:
+                pass
+
+        object.__setattr__(self, 'v_count', len(offsets) - 1)
+        object.__setattr__(self, 'offsets', memoryview(offsets).toreadonly())
+        object.__setattr__(self, 'targets', memoryview(targets).toreadonly())
+        object.__setattr__(self, 'weights', weights)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenDirectedGraph is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenDirectedGraph is immutable')
+
+    def __reduce__(self):
+        # snapshots are sent to worker processes, so pickle the arrays behind the read-only views
+        weights = self.weights.obj if isinstance(self.weights, memoryview) else self.weights
+        return _restore_frozen_directed, (self.offsets.obj, self.targets.obj, weights)
+
+    def __str__(self):
+        """
+        Return content of the snapshot in human-readable form
+        """
+        return f"FROZEN GRAPH ({self.v_count} vertices, {len(self.targets)} edges)"
+
+    # ------------------------------------------------------------------ #
+
+    def get_vertices(self) -> []:
+        """
+        This method returns a list of vertices in the snapshot in ascending order.
+        """
+        return list(range(self.v_count))
+
+    def get_edges(self) -> []:
+        """
+        This method returns a list of edges in the snapshot given as tuples of (src vertex, dst vertex, weight).
+        """
+        edge_list = []
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        for src in range(self.v_count):
+            for pos in range(offsets[src], offsets[src + 1]):
+                edge_list.append((src, targets[pos], weights[pos]))
+        return edge_list
+
+    def has_edge(self, src: int, dst: int) -> bool:
+        """
+        This method returns True if there is an edge from src to dst, otherwise False. Uses a binary search on the
+        sorted destinations of src.
+        """
+        if not 0 <= src < self.v_count:
+            return False
+        end = self.offsets[src + 1]
+        pos = bisect_left(self.targets, dst, self.offsets[src], end)
+        return pos < end and self.targets[pos] == dst
+
+    def is_valid_path(self, path: []) -> bool:
+        """
+        This method requires a list of vertex indices as input and returns True if you can travel from the start
+        vertex to the end over edges in the snapshot, otherwise False. A blank path is valid.
+        """
+        if len(path) == 1:
+            return 0 <= path[0] < self.v_count
+
+        for index in range(len(path) - 1):
+            if not self.has_edge(path[index], path[index + 1]):
+                return False
+        return True
+
+    def dfs(self, v_start, v_end=None) -> []:
+        """
+        This method performs a depth first search on the snapshot and returns a list of vertices visited, visiting
+        the vertex with the smallest index first. Same inputs and results as DirectedGraph.dfs().
+        """
+        visited_verts = []
+        if not 0 <= v_start < self.v_count:
+            return visited_verts
+
+        offsets, targets = self.offsets, self.targets
+        visited = bytearray(self.v_count)
+        next_verts = [v_start]
+
+        while next_verts:
+            src_vert = next_verts.pop()
+
+            if src_vert == v_end:
+                visited_verts.append(src_vert)
+                return visited_verts
+
+            if not visited[src_vert]:
+                visited[src_vert] = 1
+                visited_verts.append(src_vert)
+                # push the destinations from the largest index down so that the smallest is on top of the stack
+                for pos in range(offsets[src_vert + 1] - 1, offsets[src_vert] - 1, -1):
+                    next_verts.append(targets[pos])
+        return visited_verts
+
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        This method performs a breadth first search on the snapshot and returns a list of vertices visited, visiting
+        the vertex with the smallest index first. Same inputs and results as DirectedGraph.bfs().
+        """
+        visited_verts = []
+        if not 0 <= v_start < self.v_count:
+            return visited_verts
+
+        offsets, targets = self.offsets, self.targets
+        visited = bytearray(self.v_count)
+        queue = deque()
+        queue.append(v_start)
+
+        while queue:
+            src_vert = queue.popleft()
+
+            if src_vert == v_end:
+                visited_verts.append(src_vert)
+                return visited_verts
+
+            if not visited[src_vert]:
+                visited[src_vert] = 1
+                visited_verts.append(src_vert)
+                queue.extend(targets[offsets[src_vert]:offsets[src_vert + 1]])
+        return visited_verts
+
+    def has_cycle(self):
+        """
+        This method returns True if the snapshot has at least one cycle, otherwise False. Uses an iterative depth
+        first search that looks for an edge back to a vertex that is still on the search path.
+        """
+        offsets, targets = self.offsets, self.targets
+        # 0 = not visited, 1 = on the current search path, 2 = finished
+        state = bytearray(self.v_count)
+
+        for root in range(self.v_count):
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, offsets[root])]
+
+            while stack:
+                vert, pos = stack[-1]
+                if pos == offsets[vert + 1]:
+                    # all edges of vert have been followed, so take it off the search path
+                    state[vert] = 2
+                    stack.pop()
+                    continue
+                stack[-1] = (vert, pos + 1)
+                dst = targets[pos]
+                if state[dst] == 1:
+                    return True
+                if state[dst] == 0:
+                    state[dst] = 1
+                    stack.append((dst, offsets[dst]))
+        return False
+
+    def dijkstra(self, src: int) -> []:
+        """
+        This method implements the Dijkstra algorithm on the snapshot and returns a list with the length of the
+        shortest path from SRC to each vertex (infinity if unreachable). Same inputs and results as
+        DirectedGraph.dijkstra().
+        """
+        if not 0 <= src < self.v_count:
+            return None
+
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        return_list = [float('inf')] * self.v_count
+        visited = bytearray(self.v_count)
+        pqueue = [(0, src)]
+
+        while pqueue:
+            weight, src_vert = heapq.heappop(pqueue)
+            if visited[src_vert]:
+                continue
+            visited[src_vert] = 1
+            return_list[src_vert] = weight
+            for pos in range(offsets[src_vert], offsets[src_vert + 1]):
+                dst_vert = targets[pos]
+                if not visited[dst_vert]:
+                    heapq.heappush(pqueue, (weights[pos] + weight, dst_vert))
+
+        return return_list
+
+
+def _restore_frozen_directed(offsets, targets, weights):
+    """
+    Rebuild a FrozenDirectedGraph from its arrays (used when unpickling)
+    """
+    snapshot = object.__new__(FrozenDirectedGraph)
+    object.__setattr__(snapshot, 'v_count', len(offsets) - 1)
+    object.__setattr__(snapshot, 'offsets', memoryview(offsets).toreadonly())
+    object.__setattr__(snapshot, 'targets', memoryview(targets).toreadonly())
+    if isinstance(weights, array):
+        weights = memoryview(weights).toreadonly()
+    object.__setattr__(snapshot, 'weights', weights)
+    return snapshot
+
 
 if __name__ == '__main__':
 
@@ -381,3 +650,15 @@ if __name__ == '__main__':
     print('\n', g)
     for i in range(5):
         print(f'DIJKSTRA {i} {g.dijkstra(i)}')
+
+
+    print("\nmethod freeze() example 1")
+    print("-------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    snapshot = g.freeze()
+    g.remove_edge(4, 3)
+    print(snapshot)
+    print(f'GRAPH    DIJKSTRA 0 {g.dijkstra(0)}')
+    print(f'SNAPSHOT DIJKSTRA 0 {snapshot.dijkstra(0)}')
@@ -0,0 +1,334 @@
+# Description: This program contains a benchmark harness for the DirectedGraph and UndirectedGraph classes. It builds
+# seeded synthetic graphs (see graph_generators) at growing sizes, times construction and the common operations, and
+# writes the timings, fitted scaling exponents and peak memory of construction as JSON. Two JSON reports from
+# different versions of the code can be compared with --compare to find regressions.
+#
+# Example: python graph_bench.py --sizes 100 1000 10000 --output bench.json
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+import graph_generators
+
+DEFAULT_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+# operations timed for each graph class, construction is always timed first
+OPERATIONS = {
+    'DirectedGraph': ('construction', 'add_edge', 'get_edges', 'bfs', 'dfs', 'has_cycle', 'dijkstra'),
+    'UndirectedGraph': ('construction', 'add_edge', 'get_edges', 'bfs', 'dfs', 'has_cycle',
+                        'get_connected_components'),
+}
+
+# number of add_edge calls timed per repeat
+ADD_EDGE_CALLS = 1000
+
+
+def build_graph(graph_name: str, n: int, edges: []):
+    """
+    This function returns a graph of the class given by name with vertices 0 to n - 1 and the input edges. Directed
+    graphs take (u, v, weight) edges, undirected graphs take (u, v) edges and use the vertex names str(0) to
+    str(n - 1).
+    """
+    if graph_name == 'DirectedGraph':
+        graph = DirectedGraph()
+        for _ in range(n):
+            graph.add_vertex()
+        for u, v, weight in edges:
+            graph.add_edge(u, v, weight)
+    else:
+        graph = UndirectedGraph()
+        for v in range(n):
+            graph.add_vertex(str(v))
+        for u, v in edges:
+            graph.add_edge(str(u), str(v))
+    return graph
+
+
+def graph_edges(graph_name: str, generator: str, n: int, seed: int) -> []:
+    """
+    This function returns the generated edges in the form build_graph() expects for the graph class.
+    """
+    edges = graph_generators.generate(generator, n, seed=seed)
+    if graph_name == 'DirectedGraph':
+        return graph_generators.add_weights(edges, seed=seed)
+    return edges
+
+
+def start_vertex(graph_name: str, n: int, edges: []) -> int:
+    """
+    This function returns the vertex the traversals start from: the source (a vertex with edges out and none in)
+    with the most edges out, or the vertex with the most edges if there is no source. Undirected edges count both
+    ways, so undirected graphs start from the vertex with the most edges. Starting from a vertex that reaches most of
+    the graph keeps bfs, dfs and dijkstra from timing almost no work.
+    """
+    out_degree = [0] * n
+    in_degree = [0] * n
+    for edge in edges:
+        u, v = edge[0], edge[1]
+        out_degree[u] += 1
+        in_degree[v] += 1
+        if graph_name != 'DirectedGraph':
+            out_degree[v] += 1
+            in_degree[u] += 1
+    sources = [v for v in range(n) if out_degree[v] and not in_degree[v]]
+    return max(sources or range(n), key=lambda v: (out_degree[v], -v))
+
+
+def vertices_reached(op: str, result) -> int:
+    """
+    This function returns the number of vertices a bfs, dfs or dijkstra result reached, or None for the other
+    operations.
+    """
+    if op in ('bfs', 'dfs'):
+        return len(result)
+    if op == 'dijkstra':
+        return sum(1 for distance in result if distance != float('inf'))
+    return None
+
+
+def operation(graph_name: str, op: str, graph, n: int, seed: int, start: int):
+    """
+    This function returns a function with no inputs that runs the operation once on the graph and returns its
+    result, and the number of calls that one run makes. The traversals start from the input start vertex.
+    """
+    if graph_name != 'DirectedGraph':
+        start = str(start)
+    if op == 'add_edge':
+        rng = random.Random(seed)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(ADD_EDGE_CALLS)]
+        if graph_name == 'DirectedGraph':
+            def run():
+                for u, v in pairs:
+                    graph.add_edge(u, v, 1)
+        else:
+            pairs = [(str(u), str(v)) for u, v in pairs]
+
+            def run():
+                for u, v in pairs:
+                    graph.add_edge(u, v)
+        return run, ADD_EDGE_CALLS
+    if op in ('bfs', 'dfs', 'dijkstra'):
+        method = getattr(graph, op)
+        return (lambda: method(start)), 1
+    return getattr(graph, op), 1
+
+
+def time_runs(run, repeat: int, budget: float):
+    """
+    This function runs the input function up to repeat times and returns (list of run times in seconds, result of
+    the last run). Stops early once the runs together take longer than budget seconds.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - begin)
+        if sum(times) > budget:
+            break
+    return times, result
+
+
+def peak_memory(graph_name: str, n: int, edges: []):
+    """
+    This function builds the graph under tracemalloc and returns (peak number of bytes allocated, seconds taken).
+    The graph is thrown away before the function returns.
+    """
+    tracemalloc.start()
+    try:
+        begin = time.perf_counter()
+        build_graph(graph_name, n, edges)
+        seconds = time.perf_counter() - begin
+        return tracemalloc.get_traced_memory()[1], seconds
+    finally:
+        tracemalloc.stop()
+
+
+def fit_exponent(points: []):
+    """
+    This function returns the slope of a least squares line through log(seconds) against log(n), i.e. the exponent
+    k in seconds ~ n ** k. Returns None if there are fewer than 2 points.
+    """
+    if len(points) < 2:
+        return None
+    xs = [math.log(point['n']) for point in points]
+    ys = [math.log(max(point['seconds'], 1e-9)) for point in points]
+    x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    return round(numerator / denominator, 3) if denominator else None
+
+
+def predict_seconds(points: [], n: int, key='seconds') -> float:
+    """
+    This function returns a guess of the run time at size n from the largest measured sizes, assuming quadratic
+    growth until two sizes have been measured. key is the timing of the points to use.
+    """
+    points = [point for point in points if key in point]
+    if not points:
+        return 0.0
+    last = points[-1]
+    exponent = 2.0
+    if len(points) >= 2:
+        before = points[-2]
+        if last[key] > 0 and before[key] > 0 and last['n'] != before['n']:
+            exponent = max(1.0, math.log(last[key] / before[key]) / math.log(last['n'] / before['n']))
+    return last[key] * (n / last['n']) ** exponent
+
+
+def run_benchmarks(graph_names=tuple(OPERATIONS), generators=graph_generators.GENERATORS, sizes=DEFAULT_SIZES,
+                   seed=0, repeat=3, budget=10.0, max_matrix_bytes=2 ** 30, memory=True, log=None) -> dict:
+    """
+    This function runs every operation of every graph class on every generator at every size and returns the
+    report as a dictionary. A size is skipped for an operation when the timings at smaller sizes predict that one
+    run would take longer than budget seconds, and for DirectedGraph when its adjacency matrix would need more than
+    max_matrix_bytes. Progress lines are passed to the log function if one is given.
+    """
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'sizes': list(sizes),
+            'repeat': repeat,
+            'budget_seconds': budget,
+        },
+        'results': [],
+    }
+
+    for graph_name in graph_names:
+        for generator in generators:
+            curves = {op: {'graph': graph_name, 'generator': generator, 'operation': op, 'points': [],
+                           'skipped': []} for op in OPERATIONS[graph_name]}
+
+            for n in sorted(sizes):
+                if graph_name == 'DirectedGraph' and n * n * 8 > max_matrix_bytes:
+                    for curve in curves.values():
+                        curve['skipped'].append({'n': n, 'reason': 'adjacency matrix over max_matrix_bytes'})
+                    continue
+                # the memory measurement builds the graph once more under tracemalloc, so it counts toward the budget
+                construction = curves['construction']
+                predicted = predict_seconds(construction['points'], n)
+                if memory:
+                    predicted += predict_seconds(construction['points'], n, 'memory_seconds')
+                if predicted > budget:
+                    for curve in curves.values():
+                        curve['skipped'].append({'n': n, 'reason': 'construction predicted over budget'})
+                    continue
+
+                edges = graph_edges(graph_name, generator, n, seed)
+                start = start_vertex(graph_name, n, edges)
+                point = {'n': n, 'edges': len(edges)}
+                # measure memory before the timed build so that only one graph is alive at a time
+                if memory:
+                    point['peak_bytes'], point['memory_seconds'] = peak_memory(graph_name, n, edges)
+                begin = time.perf_counter()
+                graph = build_graph(graph_name, n, edges)
+                point['seconds'] = time.perf_counter() - begin
+                construction['points'].append(point)
+                if log:
+                    log(f'{graph_name} {generator} n={n} construction {point["seconds"]:.4f}s')
+
+                # add_edge changes the graph, so run it after the operations that only read it
+                for op in sorted(OPERATIONS[graph_name][1:], key=lambda op: op == 'add_edge'):
+                    curve = curves[op]
+                    if predict_seconds(curve['points'], n) > budget:
+                        curve['skipped'].append({'n': n, 'reason': 'predicted over budget'})
+                        continue
+                    run, calls = operation(graph_name, op, graph, n, seed, start)
+                    times, result = time_runs(run, repeat, budget)
+                    curve['points'].append({
+                        'n': n,
+                        'edges': len(edges),
+                        'seconds': min(times) / calls,
+                        'median_seconds': statistics.median(times) / calls,
+                        'runs': len(times),
+                    })
+                    # a traversal that reaches only a few vertices times almost no work, so record how many it did
+                    reached = vertices_reached(op, result)
+                    if reached is not None:
+                        curve['points'][-1]['start'] = start
+                        curve['points'][-1]['reached'] = reached
+                    if log:
+                        log(f'{graph_name} {generator} n={n} {op} {min(times) / calls:.6f}s')
+                # free the graph before the next size is built
+                graph = run = result = None
+
+            for curve in curves.values():
+                curve['exponent'] = fit_exponent(curve['points'])
+                report['results'].append(curve)
+    return report
+
+
+def compare(old: dict, new: dict, threshold=1.25) -> []:
+    """
+    This function compares two reports and returns a list of (graph, generator, operation, n, old seconds,
+    new seconds, ratio) tuples for every point that got slower by more than the threshold ratio.
+    """
+    old_points = dict()
+    for curve in old['results']:
+        for point in curve['points']:
+            old_points[(curve['graph'], curve['generator'], curve['operation'], point['n'])] = point['seconds']
+
+    regressions = []
+    for curve in new['results']:
+        for point in curve['points']:
+            key = (curve['graph'], curve['generator'], curve['operation'], point['n'])
+            if key in old_points and old_points[key] > 0:
+                ratio = point['seconds'] / old_points[key]
+                if ratio > threshold:
+                    regressions.append(key + (old_points[key], point['seconds'], round(ratio, 2)))
+    return regressions
+
+
+def main(argv=None) -> int:
+    """
+    Run the benchmarks from the command line. Returns 1 if --compare found a regression, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the graph classes on synthetic graphs.')
+    parser.add_argument('--graphs', nargs='+', choices=list(OPERATIONS), default=list(OPERATIONS))
+    parser.add_argument('--generators', nargs='+', choices=graph_generators.GENERATORS,
+                        default=list(graph_generators.GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--budget', type=float, default=10.0, help='seconds allowed for one run of an operation')
+    parser.add_argument('--max-matrix-bytes', type=int, default=2 ** 30)
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak memory measurement')
+    parser.add_argument('--output', help='write the JSON report to this file instead of stdout')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.graphs, args.generators, args.sizes, args.seed, args.repeat, args.budget,
+                            args.max_matrix_bytes, not args.no_memory,
+                            log=lambda line: print(line, file=sys.stderr))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), report, args.threshold)
+        for graph, generator, op, n, old_seconds, new_seconds, ratio in regressions:
+            print(f'REGRESSION {graph} {generator} {op} n={n}: {old_seconds:.6f}s -> {new_seconds:.6f}s '
+                  f'({ratio}x)', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# Description: This program contains seeded generators of synthetic graphs used by the benchmarks. Every generator
+# returns a list of (u, v) edges between the integer vertices 0 to n - 1 (u -> v for directed graphs) and gives the
+# same edges for the same seed, so results can be compared between runs and versions of the graph classes.
+
+import random
+from math import isqrt
+
+GENERATORS = ('erdos_renyi', 'barabasi_albert', 'grid', 'random_dag')
+
+
+def erdos_renyi(n: int, avg_degree=4, seed=0) -> []:
+    """
+    This function returns the edges of an Erdos-Renyi random graph G(n, m) with n vertices and m = n * avg_degree / 2
+    distinct edges chosen uniformly at random. No loops or duplicate edges.
+    """
+    rng = random.Random(seed)
+    num_edges = min(n * avg_degree // 2, n * (n - 1) // 2)
+    edges = set()
+    while len(edges) < num_edges:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v and (v, u) not in edges:
+            edges.add((u, v))
+    return sorted(edges)
+
+
+def barabasi_albert(n: int, m=2, seed=0) -> []:
+    """
+    This function returns the edges of a Barabasi-Albert preferential attachment graph. The first m + 1 vertices form
+    a complete graph, then every new vertex adds edges to m distinct existing vertices chosen with probability
+    proportional to their degree, which gives a power-law degree distribution. Edges point from the older vertex to
+    the newer one, so vertex 0 reaches every vertex.
+    """
+    rng = random.Random(seed)
+    m = max(1, min(m, n - 1))
+    edges = [(v, u) for v in range(m + 1) for u in range(v + 1, m + 1) if u < n]
+
+    # every vertex appears in repeated once per edge it has, so a uniform choice from it is degree proportional
+    repeated = [u for edge in edges for u in edge]
+    for v in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(repeated))
+        for u in sorted(targets):
+            edges.append((u, v))
+            repeated.append(u)
+            repeated.append(v)
+    return edges
+
+
+def grid(n: int, drop=0.1, two_way=True, seed=0) -> []:
+    """
+    This function returns the edges of a road-like grid graph with n vertices laid out row by row in a nearly square
+    grid. Every vertex is joined to its right and lower neighbor, then the fraction drop of those streets is removed
+    at random. If two_way is True each street is given in both directions.
+    """
+    rng = random.Random(seed)
+    cols = max(1, isqrt(n))
+    edges = []
+    for v in range(n):
+        for u in (v + 1 if (v + 1) % cols else n, v + cols):
+            if u < n and rng.random() >= drop:
+                edges.append((v, u))
+                if two_way:
+                    edges.append((u, v))
+    return edges
+
+
+def random_dag(n: int, avg_degree=4, seed=0) -> []:
+    """
+    This function returns the edges of a random directed acyclic graph with n vertices and about n * avg_degree / 2
+    distinct edges. The vertices are put in a random order and every edge points from an earlier to a later vertex
+    in that order, so there are no cycles. Every vertex but the first in the order has an edge in from an earlier
+    vertex, so the first vertex is the only source and reaches every vertex.
+    """
+    rng = random.Random(seed)
+    order = list(range(n))
+    rng.shuffle(order)
+    num_edges = min(n * avg_degree // 2, n * (n - 1) // 2)
+    edges = set()
+    for j in range(1, n):
+        edges.add((order[rng.randrange(j)], order[j]))
+    while len(edges) < num_edges:
+        i, j = rng.randrange(n), rng.randrange(n)
+        if i < j:
+            edges.add((order[i], order[j]))
+    return sorted(edges)
+
+
+def generate(name: str, n: int, seed=0) -> []:
+    """
+    This function returns the edges of the generator given by name (one of GENERATORS) with default parameters.
+    """
+    if name not in GENERATORS:
+        raise ValueError(f'unknown generator {name!r}')
+    return globals()[name](n, seed=seed)
+
+
+def add_weights(edges: [], low=1, high=100, seed=0) -> []:
+    """
+    This function returns the input edges as (u, v, weight) tuples with integer weights chosen uniformly from
+    low to high.
+    """
+    rng = random.Random(seed)
+    return [(u, v, rng.randint(low, high)) for u, v in edges]
+
+
+if __name__ == '__main__':
+
+    for name in GENERATORS:
+        print(f'{name:16} {generate(name, 10, seed=1)}')
@@ -0,0 +1,406 @@
+# Description: This program contains a partitioner that splits a DirectedGraph or UndirectedGraph into k shards and
+# a level-synchronous breadth first search that runs the shards in separate processes. partition() grows the shards
+# by BFS and can refine them with label propagation, and every shard keeps the adjacency of the vertices it owns plus
+# a table of its boundary vertices and the owners of their remote neighbors. ParallelBFS starts one process per shard
+# and passes the frontier batches between them level by level.
+
+import multiprocessing
+import random
+from array import array
+from collections import deque
+from math import ceil
+
+from d_graph import DirectedGraph, FrozenDirectedGraph
+from ud_graph import UndirectedGraph, FrozenUndirectedGraph
+
+METHODS = ('bfs', 'label_propagation')
+
+
+class GraphShard:
+    """
+    Class to hold one shard of a ShardedGraph
+    - vertices: global numbers of the vertices the shard owns, ascending
+    - local_index: {global number: position in vertices}
+    - offsets, targets: out edges of vertices[i] are targets[offsets[i]:offsets[i + 1]] (global numbers)
+    - boundary_vertices: owned vertices with at least one edge to another shard
+    - ghost_owner: {global number of a remote neighbor: shard that owns it}
+    """
+
+    __slots__ = ('shard_id', 'vertices', 'local_index', 'offsets', 'targets', 'boundary_vertices', 'ghost_owner')
+
+    def __init__(self, shard_id, vertices, offsets, targets, owner):
+        """
+        Build the shard from its owned vertices and their compressed rows, using owner (shard of every global
+        vertex) to fill the boundary tables.
+        """
+        self.shard_id = shard_id
+        self.vertices = vertices
+        self.local_index = {v: num for num, v in enumerate(vertices)}
+        self.offsets = offsets
+        self.targets = targets
+        self.boundary_vertices = array('q')
+        self.ghost_owner = dict()
+
+        for num, v in enumerate(vertices):
+            remote = False
+            for pos in range(offsets[num], offsets[num + 1]):
+                target_owner = owner[targets[pos]]
+                if target_owner != shard_id:
+                    self.ghost_owner[targets[pos]] = target_owner
+                    remote = True
+            if remote:
+                self.boundary_vertices.append(v)
+
+    def __str__(self):
+        """
+        Return a summary of the shard in human-readable form
+        """
+        return (f"SHARD {self.shard_id} ({len(self.vertices)} vertices, {len(self.targets)} edges, "
+                f"{len(self.boundary_vertices)} boundary, {len(self.ghost_owner)} ghosts)")
+
+
+class ShardedGraph:
+    """
+    Class to hold a graph split into shards by partition()
+    - vertices are numbered like the frozen snapshot of the graph (names maps numbers back to vertex names for
+      undirected graphs, directed graphs already use numbers as names)
+    - owner[v] is the shard that owns vertex number v
+    - shards is the list of GraphShard
+    - only the structure of the graph is kept: edge weights are dropped, ParallelBFS counts edges
+    """
+
+    __slots__ = ('names', 'index', 'owner', 'shards')
+
+    def __init__(self, names, owner, shards):
+        self.names = names
+        self.index = None if names is None else {v: num for num, v in enumerate(names)}
+        self.owner = owner
+        self.shards = shards
+
+    def __str__(self):
+        """
+        Return a summary of the shards in human-readable form
+        """
+        out = '\n  '.join(str(shard) for shard in self.shards)
+        return f"SHARDED GRAPH ({len(self.owner)} vertices, {self.edge_cut()} cut edges):\n  {out}"
+
+    def vertex_number(self, v):
+        """
+        This method returns the number of the vertex with the input name, or None if there is no such vertex.
+        """
+        if self.index is None:
+            return v if isinstance(v, int) and 0 <= v < len(self.owner) else None
+        return self.index.get(v)
+
+    def vertex_name(self, num: int):
+        """
+        This method returns the name of the vertex with the input number.
+        """
+        return num if self.names is None else self.names[num]
+
+    def edge_cut(self) -> int:
+        """
+        This method returns the number of stored edges that go between two different shards.
+        """
+        cut = 0
+        for shard in self.shards:
+            for target in shard.targets:
+                if self.owner[target] != shard.shard_id:
+                    cut += 1
+        return cut
+
+    def parallel_bfs(self, v_start) -> dict:
+        """
+        This method runs one ParallelBFS from v_start and returns {vertex: number of edges from v_start} for
+        every vertex reached. Starts and stops the shard processes, so use ParallelBFS directly for many searches.
+        """
+        with ParallelBFS(self) as search:
+            return search.bfs(v_start)
+
+
+def _compressed_rows(graph):
+    """
+    Return (names, offsets, targets) of the graph: the compressed rows of its frozen snapshot, with names None
+    for directed graphs
+    """
+    if isinstance(graph, (DirectedGraph, UndirectedGraph)):
+        graph = graph.freeze()
+    if isinstance(graph, FrozenDirectedGraph):
+        return None, graph.offsets, graph.targets
+    if isinstance(graph, FrozenUndirectedGraph):
+        return graph.vertices, graph.offsets, graph.targets
+    raise TypeError(f'cannot partition {type(graph).__name__}')
+
+
+def _bfs_grow(offsets, targets, k, rng):
+    """
+    Return the owner list of a BFS-grown partition: shards are filled one at a time by a breadth first search from
+    a random unassigned vertex, jumping to a new random vertex when the search runs out, until they hold
+    ceil(n / k) vertices
+    """
+    num_verts = len(offsets) - 1
+    capacity = ceil(num_verts / k) if num_verts else 0
+    owner = array('q', [-1]) * num_verts
+    seeds = list(range(num_verts))
+    rng.shuffle(seeds)
+    next_seed = 0
+
+    for shard in range(k):
+        size = 0
+        queue = deque()
+        while size < capacity:
+            if not queue:
+                # start (or restart) the search at the next unassigned vertex
+                while next_seed < num_verts and owner[seeds[next_seed]] != -1:
+                    next_seed += 1
+                if next_seed == num_verts:
+                    return owner
+                owner[seeds[next_seed]] = shard
+                size += 1
+                queue.append(seeds[next_seed])
+                continue
+            v = queue.popleft()
+            for pos in range(offsets[v], offsets[v + 1]):
+                target = targets[pos]
+                if owner[target] == -1 and size < capacity:
+                    owner[target] = shard
+                    size += 1
+                    queue.append(target)
+    return owner
+
+
+def _label_propagation(offsets, targets, owner, k, rng, rounds, imbalance):
+    """
+    Improve the partition in place: every round each vertex (in random order) moves to the shard most of its
+    neighbors are in, if that shard has more of its neighbors than its own shard and is not full
+    """
+    num_verts = len(offsets) - 1
+    capacity = ceil(num_verts / k * (1 + imbalance)) if num_verts else 0
+    sizes = [0] * k
+    for shard in owner:
+        sizes[shard] += 1
+    order = list(range(num_verts))
+
+    for _ in range(rounds):
+        rng.shuffle(order)
+        moved = 0
+        for v in order:
+            counts = dict()
+            for pos in range(offsets[v], offsets[v + 1]):
+                shard = owner[targets[pos]]
+                counts[shard] = counts.get(shard, 0) + 1
+            if not counts:
+                continue
+            current = owner[v]
+            best = max(counts, key=counts.get)
+            if counts[best] > counts.get(current, 0) and sizes[best] < capacity:
+                owner[v] = best
+                sizes[current] -= 1
+                sizes[best] += 1
+                moved += 1
+        if not moved:
+            break
+    return owner
+
+
+def partition(graph, k: int, method='bfs', seed=0, rounds=10, imbalance=0.05) -> ShardedGraph:
+    """
+    This function splits the input graph (DirectedGraph, UndirectedGraph or a snapshot of one) into k shards and
+    returns a ShardedGraph. With method 'bfs' the shards are grown by breadth first search to ceil(n / k) vertices
+    each. With method 'label_propagation' the BFS-grown shards are then refined for up to rounds rounds, letting
+    shards grow to (1 + imbalance) * n / k vertices to cut fewer edges. For directed graphs only out edges are
+    used. The seed makes the result reproducible.
+    """
+    if k < 1:
+        raise ValueError('k must be at least 1')
+    if method not in METHODS:
+        raise ValueError(f'unknown partition method {method!r}')
+
+    names, offsets, targets = _compressed_rows(graph)
+    rng = random.Random(seed)
+    owner = _bfs_grow(offsets, targets, k, rng)
+    if method == 'label_propagation':
+        owner = _label_propagation(offsets, targets, owner, k, rng, rounds, imbalance)
+
+    # copy the compressed rows of every owned vertex into its shard
+    owned = [array('q') for _ in range(k)]
+    for v, shard in enumerate(owner):
+        owned[shard].append(v)
+    shards = []
+    for shard, vertices in enumerate(owned):
+        shard_offsets = array('q', [0])
+        shard_targets = array('q')
+        for v in vertices:
+            shard_targets.extend(targets[offsets[v]:offsets[v + 1]])
+            shard_offsets.append(len(shard_targets))
+        shards.append(GraphShard(shard, vertices, shard_offsets, shard_targets, owner))
+    return ShardedGraph(names, owner, shards)
+
+
+def _shard_worker(shard, conn):
+    """
+    Run the searches of one shard in its own process. Commands arrive on conn:
+    ('reset',) clears the search, ('level', level, batch) settles the unvisited vertices of batch plus the
+    vertices found locally in the last level and answers (settled, pending, {shard: batch}), ('collect',) answers
+    the (vertices, levels) reached, ('stop',) ends the process.
+    """
+    local_index, offsets, targets, ghost_owner = shard.local_index, shard.offsets, shard.targets, shard.ghost_owner
+    # position of every target in this shard, or -1 if another shard owns it, so the search needs no lookups
+    local_targets = array('q', (local_index.get(target, -1) for target in targets))
+    level_of = array('q', [-1]) * len(shard.vertices)
+    pending = []
+
+    while True:
+        command = conn.recv()
+        if command[0] == 'level':
+            _, level, batch = command
+            frontier = []
+            for num in pending + [local_index[v] for v in batch]:
+                if level_of[num] == -1:
+                    level_of[num] = level
+                    frontier.append(num)
+
+            pending = []
+            outgoing = dict()
+            for num in frontier:
+                for pos in range(offsets[num], offsets[num + 1]):
+                    target_num = local_targets[pos]
+                    if target_num == -1:
+                        outgoing.setdefault(ghost_owner[targets[pos]], set()).add(targets[pos])
+                    elif level_of[target_num] == -1:
+                        pending.append(target_num)
+            conn.send((len(frontier), len(pending),
+                       {owner: array('q', sorted(batch)) for owner, batch in outgoing.items()}))
+        elif command[0] == 'collect':
+            reached = array('q')
+            levels = array('q')
+            for num, level in enumerate(level_of):
+                if level != -1:
+                    reached.append(shard.vertices[num])
+                    levels.append(level)
+            conn.send((reached, levels))
+        elif command[0] == 'reset':
+            level_of = array('q', [-1]) * len(shard.vertices)
+            pending = []
+        else:
+            conn.close()
+            return
+
+
+class ParallelBFS:
+    """
+    Class to run level-synchronous breadth first searches on a ShardedGraph with one process per shard
+    - use as a context manager: with ParallelBFS(sharded) as search: search.bfs(v_start)
+    - every level, each shard settles its frontier and expands it, keeping neighbors it owns for the next level
+      and sending the others to their owners in one batch per shard
+    - only the boundary batches pass through this process, the adjacency stays in the shard processes
+    """
+
+    def __init__(self, sharded: ShardedGraph, mp_context=None):
+        """
+        Create the search for the input ShardedGraph. The shard processes are started by start() or on entering
+        the context manager, using mp_context (default multiprocessing context if None).
+        """
+        self.sharded = sharded
+        self.mp_context = mp_context if mp_context is not None else multiprocessing.get_context()
+        self.processes = []
+        self.conns = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        """
+        This method starts one process per shard. If the processes are already running, the method does nothing.
+        No return value.
+        """
+        if self.processes:
+            return
+        for shard in self.sharded.shards:
+            conn, child_conn = self.mp_context.Pipe()
+            process = self.mp_context.Process(target=_shard_worker, args=(shard, child_conn), daemon=True)
+            process.start()
+            child_conn.close()
+            self.processes.append(process)
+            self.conns.append(conn)
+
+    def stop(self) -> None:
+        """
+        This method stops the shard processes. No return value.
+        """
+        for conn in self.conns:
+            conn.send(('stop',))
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.processes = []
+        self.conns = []
+
+    def bfs(self, v_start) -> dict:
+        """
+        This method performs a breadth first search from v_start across the shards and returns {vertex: number of
+        edges from v_start} for every vertex reached. If v_start is not in the graph, returns an empty dictionary.
+        """
+        source = self.sharded.vertex_number(v_start)
+        if source is None:
+            return dict()
+        self.start()
+        for conn in self.conns:
+            conn.send(('reset',))
+
+        empty = array('q')
+        incoming = {self.sharded.owner[source]: array('q', [source])}
+        # shards that found vertices of their own for the next level
+        waiting = set()
+        level = 0
+
+        while incoming or waiting:
+            active = sorted(waiting.union(incoming))
+            for shard in active:
+                self.conns[shard].send(('level', level, incoming.get(shard, empty)))
+
+            incoming = dict()
+            waiting = set()
+            for shard in active:
+                _, pending, outgoing = self.conns[shard].recv()
+                if pending:
+                    waiting.add(shard)
+                for owner, batch in outgoing.items():
+                    incoming.setdefault(owner, array('q')).extend(batch)
+            level += 1
+
+        distances = dict()
+        for conn in self.conns:
+            conn.send(('collect',))
+        for conn in self.conns:
+            reached, levels = conn.recv()
+            for v, v_level in zip(reached, levels):
+                distances[self.sharded.vertex_name(v)] = v_level
+        return distances
+
+
+if __name__ == '__main__':
+
+    print("\npartition() / ParallelBFS example 1")
+    print("-----------------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG', 'HQ']
+    g = UndirectedGraph(edges)
+    for method in METHODS:
+        sharded = partition(g, 3, method=method, seed=1)
+        print(f'{method}: {sharded}')
+    print(sharded.parallel_bfs('A'))
+
+    print("\npartition() / ParallelBFS example 2")
+    print("-----------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    sharded = partition(g, 2)
+    print(sharded)
+    with ParallelBFS(sharded) as search:
+        for start in range(5):
+            print(f'{start} {search.bfs(start)}')
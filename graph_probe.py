@@ -0,0 +1,140 @@
+# Description: This program contains GraphProbe, the opt-in instrumentation for the DirectedGraph and UndirectedGraph
+# classes. A probe times every outside call to the public methods of the graphs it is attached to and adds up the work
+# counters that dijkstra(), bfs() and dfs() report. Graphs without a probe run their normal methods, so there is no
+# overhead when instrumentation is off.
+
+import threading
+from time import perf_counter
+
+
+class GraphProbe:
+    """
+    Class to collect instrumentation from graphs
+    - attach with attach(graph) or as a context manager: with GraphProbe(graph) as probe: ...
+    - calls holds the number of calls, total seconds and max seconds of each method
+    - counters holds the totals of the work counters of each method
+    - callback(graph, method, seconds, counters) is called after every call if given
+    - only the outermost call of each thread is recorded: calls a graph method makes to other methods (e.g. bfs()
+      inside get_connected_components()) are not counted again, and their work counters are added to the
+      outermost call, so the time and work of a call are always reported together
+    - one probe per graph, but one probe can be attached to many graphs
+
+    Counters reported by dijkstra(), bfs() and dfs():
+    - vertices_settled: vertices taken off the heap/queue/stack for the first time
+    - edges_scanned: edges followed out of settled vertices
+    - pushes, pops: entries pushed to and popped from the heap/queue/stack
+    - stale_entries: popped entries for vertices that were already settled
+    """
+
+    def __init__(self, *graphs, callback=None):
+        """
+        Create the probe for the input graphs. The graphs are attached when the context manager is entered.
+        """
+        self.graphs = list(graphs)
+        self.callback = callback
+        self.calls = dict()
+        self.counters = dict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self):
+        for graph in self.graphs:
+            self.attach(graph)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for graph in self.graphs:
+            self.detach(graph)
+
+    def attach(self, graph) -> None:
+        """
+        This method starts collecting instrumentation from the input graph by replacing its public methods with
+        timed versions on the instance. Raises ValueError if the graph already has a probe attached. No return value.
+        """
+        if graph._probe is not None:
+            raise ValueError('graph already has a probe attached')
+        graph._probe = self
+        for name in dir(type(graph)):
+            method = getattr(graph, name)
+            if not name.startswith('_') and callable(method):
+                setattr(graph, name, self._timed(graph, name, method))
+
+    def detach(self, graph) -> None:
+        """
+        This method stops collecting instrumentation from the input graph and gives it back its normal methods. If
+        this probe is not attached to the graph, the method does nothing. No return value.
+        """
+        if graph.__dict__.get('_probe') is not self:
+            return
+        for name in dir(type(graph)):
+            if not name.startswith('_') and name in graph.__dict__:
+                delattr(graph, name)
+        del graph._probe
+
+    def reset(self) -> None:
+        """
+        This method clears the collected calls and counters. No return value.
+        """
+        with self._lock:
+            self.calls = dict()
+            self.counters = dict()
+
+    def report(self) -> dict:
+        """
+        This method returns a copy of the collected instrumentation as {method: {'calls': .., 'seconds': ..,
+        'max_seconds': .., counter: total, ..}}.
+        """
+        with self._lock:
+            out = {name: dict(stats) for name, stats in self.calls.items()}
+            for name, counters in self.counters.items():
+                out.setdefault(name, dict()).update(counters)
+        return out
+
+    def count(self, method: str, **counters) -> None:
+        """
+        This method is called by the graph methods to report their work counters for the current call. The counters
+        are added to the outermost timed call of this thread, or to method if there is none. No return value.
+        """
+        current = getattr(self._local, 'current', None)
+        if current is not None:
+            method, call_counters = current
+            for name, value in counters.items():
+                call_counters[name] = call_counters.get(name, 0) + value
+
+        with self._lock:
+            totals = self.counters.setdefault(method, dict())
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+
+    def _timed(self, graph, name, method):
+        """
+        Return a function that runs the method and records its time, unless it is called from inside another
+        recorded call of the same thread
+        """
+        def timed(*args, **kwargs):
+            if getattr(self._local, 'current', None) is not None:
+                return method(*args, **kwargs)
+            counters = dict()
+            self._local.current = (name, counters)
+            begin = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - begin
+                self._local.current = None
+                self._record(graph, name, seconds, counters)
+        return timed
+
+    def _record(self, graph, name, seconds, counters):
+        """
+        Add one call to the collected calls and pass it to the callback
+        """
+        with self._lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0}
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        if self.callback is not None:
+            self.callback(graph, name, seconds, counters)
@@ -0,0 +1,341 @@
+# Description: This program contains an asyncio front-end for the graph classes in d_graph and ud_graph. The class
+# GraphQueryService answers queries (dijkstra, bfs, dfs, is_valid_path, connected components) on loaded graphs from
+# inside an event loop, and serve() exposes a service over a local socket using one JSON object per line.
+
+import asyncio
+import json
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from d_graph import DirectedGraph, FrozenDirectedGraph
+from ud_graph import UndirectedGraph, FrozenUndirectedGraph
+
+# queries that can be asked of each kind of snapshot
+DIRECTED_QUERIES = frozenset(['dijkstra', 'bfs', 'dfs', 'is_valid_path', 'has_cycle'])
+UNDIRECTED_QUERIES = frozenset(['bfs', 'dfs', 'is_valid_path', 'has_cycle', 'get_edge_weight',
+                                'count_connected_components', 'get_connected_components'])
+
+
+# snapshots this worker process has received, as {name: (version, snapshot)}
+_worker_snapshots = dict()
+
+
+class _MissingSnapshot:
+    """
+    Returned by _run_worker_query when the worker does not have the snapshot yet
+    """
+
+
+def _run_query(snapshot, method, args):
+    """
+    Run one query on a snapshot and return the result
+    """
+    return getattr(snapshot, method)(*args)
+
+
+def _run_worker_query(name, version, method, args, live, snapshot=None):
+    """
+    Run one query on the cached snapshot of name (runs in a worker process). Snapshots are only sent along when the
+    worker asked for one by returning _MissingSnapshot, so each worker receives each version of a graph once. live is
+    the set of (name, version) pairs loaded in the service, every other cached snapshot is dropped.
+    """
+    # forget the graphs that were unloaded or replaced since this worker last ran a query
+    for cached_name, (cached_version, _) in list(_worker_snapshots.items()):
+        if (cached_name, cached_version) not in live:
+            del _worker_snapshots[cached_name]
+
+    if snapshot is not None:
+        # a query on a version that is no longer loaded runs on the snapshot it brought along without caching it
+        if (name, version) in live:
+            _worker_snapshots[name] = (version, snapshot)
+        return _run_query(snapshot, method, args)
+    cached = _worker_snapshots.get(name)
+    if cached is None or cached[0] != version:
+        return _MissingSnapshot()
+    return _run_query(cached[1], method, args)
+
+
+def _hashable(value):
+    """
+    Return the input with lists converted to tuples so it can be used as part of a dictionary key
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _json_safe(value):
+    """
+    Return the input with infinite and NaN floats (e.g. unreachable vertices in dijkstra) replaced by None, since
+    JSON has no value for them
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+class GraphQueryService:
+    """
+    Class to answer graph queries from asyncio code
+    - graphs are loaded by name and queried through immutable snapshots
+    - every query runs in a process pool so none of them block the event loop
+    - each worker keeps the snapshots it has received, so a snapshot is sent to a worker once, not with every query;
+      a worker drops the snapshots of unloaded or replaced graphs on its next query
+    - identical queries that arrive while one is already running share its result
+    - at most max_pending queries run at once, later callers wait in query() for a free slot before the service
+      starts (or holds on to) anything for them
+    """
+
+    def __init__(self, max_workers=None, max_pending=64, executor=None):
+        """
+        Create the service. The process pool is created with max_workers processes unless an executor is given.
+        The pool starts its workers with spawn rather than fork: the workers are started on the first query, when
+        client sockets are already open, and forked workers would inherit them and keep the connections from
+        closing. As with any spawn pool, scripts that create the service need an if __name__ == '__main__' guard.
+        """
+        self.snapshots = dict()
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context('spawn'))
+            self._own_executor = True
+        else:
+            self._own_executor = False
+        self.executor = executor
+        self._slots = asyncio.Semaphore(max_pending)
+        self._in_flight = dict()
+        self._versions = dict()
+        self._live = frozenset()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        This method shuts down the process pool if the service created it. No return value.
+        """
+        if self._own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def load(self, name: str, graph) -> None:
+        """
+        This method loads a graph under the input name, replacing any graph already loaded under that name. The graph
+        can be a DirectedGraph, an UndirectedGraph or a snapshot of one. Live graphs are frozen here, so later changes
+        to them are only seen after calling load() again. Queries already running finish on the old snapshot.
+        No return value.
+        """
+        if isinstance(graph, (DirectedGraph, UndirectedGraph)):
+            graph = graph.freeze()
+        if not isinstance(graph, (FrozenDirectedGraph, FrozenUndirectedGraph)):
+            raise TypeError(f'cannot load {type(graph).__name__} as a graph')
+
+        # the version is part of the coalescing key, so queries on the new snapshot never share old results
+        self._versions[name] = self._versions.get(name, 0) + 1
+        self.snapshots[name] = graph
+        self._update_live()
+
+    def unload(self, name: str) -> None:
+        """
+        This method removes the graph loaded under the input name. If there is no such graph, the method does
+        nothing. No return value.
+        """
+        self.snapshots.pop(name, None)
+        self._update_live()
+
+    def _update_live(self):
+        """
+        Rebuild the set of (name, version) pairs loaded, which the workers use to drop snapshots they no longer need
+        """
+        self._live = frozenset((name, self._versions[name]) for name in self.snapshots)
+
+    async def query(self, name: str, method: str, *args):
+        """
+        This method runs a query on the graph loaded under the input name and returns its result, e.g.
+        await service.query('roads', 'dijkstra', 0). Raises KeyError if no graph is loaded under that name and
+        ValueError if the method is not a supported query for that kind of graph.
+        """
+        snapshot = self.snapshots[name]
+        allowed = DIRECTED_QUERIES if isinstance(snapshot, FrozenDirectedGraph) else UNDIRECTED_QUERIES
+        if method not in allowed:
+            raise ValueError(f'unsupported query {method!r} for {type(snapshot).__name__}')
+
+        # every query goes to the pool, even is_valid_path: a long path through vertices with many neighbors is slow
+        args = _hashable(args)
+
+        # join an identical query that is already running instead of starting another one
+        version = self._versions[name]
+        key = (name, version, method, args)
+        future = self._in_flight.get(key)
+        if future is None:
+            # wait for a free slot before starting the query, so at most max_pending queries are in flight
+            await self._slots.acquire()
+            future = self._in_flight.get(key)
+            if future is not None:
+                # an identical query started while this one waited
+                self._slots.release()
+            else:
+                future = asyncio.ensure_future(self._offload(name, version, snapshot, method, args))
+                self._in_flight[key] = future
+                future.add_done_callback(lambda _: self._finished(key))
+
+        # shield the shared future so one caller giving up does not cancel it for the others
+        return await asyncio.shield(future)
+
+    def _finished(self, key):
+        """
+        Forget a finished query and give its slot back
+        """
+        self._in_flight.pop(key, None)
+        self._slots.release()
+
+    async def _offload(self, name, version, snapshot, method, args):
+        """
+        Run the query in the executor, sending the snapshot only to a worker that does not have it yet
+        """
+        loop = asyncio.get_running_loop()
+        live = self._live
+        result = await loop.run_in_executor(self.executor, _run_worker_query, name, version, method, args, live)
+        if isinstance(result, _MissingSnapshot):
+            result = await loop.run_in_executor(self.executor, _run_worker_query, name, version, method, args, live,
+                                                snapshot)
+        return result
+
+
+async def _read_request_line(reader):
+    """
+    Return the next line sent on the connection (b'' at the end), or None if the line is longer than the reader's
+    limit. The rest of a line that is too long is read and thrown away, so the next line starts a new request.
+    """
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as err:
+        return err.partial
+    except asyncio.LimitOverrunError as err:
+        skip = err.consumed
+    while True:
+        await reader.readexactly(skip)
+        try:
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as err:
+            skip = err.consumed
+
+
+async def _handle_connection(service, reader, writer, max_per_connection):
+    """
+    Answer the requests sent on one connection. Each line is a JSON object {"id": .., "graph": .., "method": ..,
+    "args": [..]} and each answer is {"id": .., "result": ..} or {"id": .., "error": ..}. Answers are written as soon
+    as they are ready, so they can arrive out of order. Infinite distances from dijkstra are sent as null. Lines that
+    are not a JSON object or are longer than the server's max_line_bytes are answered with an error and id null.
+    """
+    # stop reading once max_per_connection requests are outstanding, so a fast client is slowed down by the socket
+    slots = asyncio.Semaphore(max_per_connection)
+    write_lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(response):
+        async with write_lock:
+            writer.write(json.dumps(response, allow_nan=False).encode() + b'\n')
+            await writer.drain()
+
+    async def answer(request):
+        try:
+            result = await service.query(request['graph'], request['method'], *request.get('args', []))
+            response = {'id': request.get('id'), 'result': _json_safe(result)}
+        except Exception as err:
+            response = {'id': request.get('id'), 'error': f'{type(err).__name__}: {err}'}
+        finally:
+            slots.release()
+        try:
+            await send(response)
+        except ConnectionError:
+            # the client went away, there is nobody to answer
+            pass
+
+    try:
+        while True:
+            await slots.acquire()
+            line = await _read_request_line(reader)
+            if not line:
+                slots.release()
+                if line is None:
+                    await send({'id': None, 'error': 'ValueError: request line is too long'})
+                    continue
+                break
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+            except ValueError as err:
+                slots.release()
+                await send({'id': None, 'error': f'ValueError: {err}'})
+                continue
+            task = asyncio.ensure_future(answer(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except ConnectionError:
+        # the client went away, stop reading
+        pass
+    finally:
+        # let the answers to earlier requests finish before closing, whichever way the loop ended
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def serve(service, host='127.0.0.1', port=0, path=None, max_per_connection=16, max_line_bytes=2 ** 24):
+    """
+    This function starts serving the input GraphQueryService and returns the asyncio server. If path is given the
+    server listens on that unix socket, otherwise on host and port (port 0 picks a free port). Request lines longer
+    than max_line_bytes are answered with an error.
+    """
+    def handler(reader, writer):
+        return _handle_connection(service, reader, writer, max_per_connection)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path, limit=max_line_bytes)
+    return await asyncio.start_server(handler, host=host, port=port, limit=max_line_bytes)
+
+
+if __name__ == '__main__':
+
+    async def main():
+        async with GraphQueryService(max_workers=2) as service:
+            service.load('directed', DirectedGraph([(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+                                                    (3, 1, 5), (2, 1, 23), (3, 2, 7)]))
+            service.load('undirected', UndirectedGraph(['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED',
+                                                        'BH', 'QG', 'FG']))
+
+            print("\nGraphQueryService in-process example 1")
+            print("--------------------------------------")
+            results = await asyncio.gather(*[service.query('directed', 'dijkstra', i) for i in range(5)])
+            for i, result in enumerate(results):
+                print(f'DIJKSTRA {i} {result}')
+            print(await service.query('directed', 'is_valid_path', [0, 1, 4, 3]))
+            print(await service.query('undirected', 'get_connected_components'))
+
+            print("\nserve() socket example 1")
+            print("------------------------")
+            server = await serve(service)
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+            requests = [{'id': 1, 'graph': 'undirected', 'method': 'bfs', 'args': ['A']},
+                        {'id': 2, 'graph': 'undirected', 'method': 'dfs', 'args': ['A', 'H']},
+                        {'id': 3, 'graph': 'directed', 'method': 'get_connected_components'}]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b'\n')
+            writer.write_eof()
+            # the server closes the connection once every request has been answered
+            async for line in reader:
+                print(line.decode().strip())
+            writer.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+# Description: This program checks GraphQueryService and serve() from graph_server: identical queries sharing one run,
+# the max_pending limit, workers dropping unloaded graphs and the replies to malformed requests. The queries run in a
+# thread pool here so the tests can see what was sent to the workers. Run it with python test_graph_server.py (or with
+# pytest).
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import graph_server
+from graph_server import GraphQueryService, serve
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """
+    Thread pool that records the (name, method, args) of every query sent to it and holds the queries back until
+    gate is set
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=8)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.sent = []
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        self.sent.append((args[0], args[2], args[3]))
+
+        def run():
+            with self._lock:
+                self.running += 1
+                self.most_running = max(self.most_running, self.running)
+            try:
+                self.gate.wait()
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+        return super().submit(run)
+
+
+def line_graph(n):
+    """
+    Return an undirected graph with the vertices 0 to n - 1 in a line
+    """
+    return UndirectedGraph([(str(v), str(v + 1)) for v in range(n - 1)])
+
+
+def test_identical_queries_share_one_run():
+    graph_server._worker_snapshots.clear()
+
+    async def main():
+        executor = RecordingExecutor()
+        service = GraphQueryService(executor=executor)
+        service.load('line', line_graph(5))
+        # the first query also sends the snapshot to the (shared) worker cache
+        await service.query('line', 'bfs', '0')
+        executor.sent.clear()
+
+        results = await asyncio.gather(*[service.query('line', 'bfs', '2') for _ in range(5)])
+        assert results == [['2', '1', '3', '0', '4']] * 5
+        assert executor.sent == [('line', 'bfs', ('2',))]
+
+        await asyncio.gather(*[service.query('line', 'bfs', str(v)) for v in range(5)])
+        assert len(executor.sent) == 6
+        assert not service._in_flight
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_max_pending_limits_queries_in_flight():
+    graph_server._worker_snapshots.clear()
+
+    async def main():
+        executor = RecordingExecutor()
+        service = GraphQueryService(max_pending=2, executor=executor)
+        service.load('line', line_graph(20))
+        executor.gate.clear()
+
+        tasks = [asyncio.ensure_future(service.query('line', 'dfs', str(v))) for v in range(20)]
+        try:
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+            # the other 18 callers wait in query() without the service holding anything for them
+            assert len(service._in_flight) == 2
+            assert executor.running == 2
+        finally:
+            # let the held back queries go, also when the checks fail
+            executor.gate.set()
+        results = await asyncio.gather(*tasks)
+        assert [result[0] for result in results] == [str(v) for v in range(20)]
+        assert executor.most_running == 2
+        assert not service._in_flight
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_workers_drop_unloaded_graphs():
+    graph_server._worker_snapshots.clear()
+
+    async def main():
+        executor = RecordingExecutor()
+        service = GraphQueryService(executor=executor)
+        service.load('a', line_graph(3))
+        service.load('b', line_graph(4))
+        await service.query('a', 'bfs', '0')
+        await service.query('b', 'bfs', '0')
+        assert set(graph_server._worker_snapshots) == {'a', 'b'}
+
+        service.unload('a')
+        service.load('b', line_graph(5))
+        assert await service.query('b', 'bfs', '4') == ['4', '3', '2', '1', '0']
+        assert set(graph_server._worker_snapshots) == {'b'}
+        assert graph_server._worker_snapshots['b'][0] == 2
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_socket_replies():
+    graph_server._worker_snapshots.clear()
+
+    async def main():
+        executor = RecordingExecutor()
+        service = GraphQueryService(executor=executor)
+        service.load('directed', DirectedGraph([(0, 1, 10), (1, 2, 5)]))
+        service.load('line', line_graph(3))
+        server = await serve(service, max_line_bytes=1000)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+
+        lines = [
+            {'id': 1, 'graph': 'directed', 'method': 'dijkstra', 'args': [1]},
+            'not json',
+            [1, 2],
+            {'id': 2, 'graph': 'line', 'method': 'is_valid_path', 'args': [['0', '1'] * 1000]},
+            {'id': 3, 'graph': 'missing', 'method': 'bfs', 'args': [0]},
+            {'id': 4, 'graph': 'line', 'method': 'is_valid_path', 'args': [['0', '1', '2']]},
+        ]
+        for line in lines:
+            writer.write((line if isinstance(line, str) else json.dumps(line)).encode() + b'\n')
+        writer.write_eof()
+        # the server answers every request, then closes the connection
+        replies = [json.loads(line) async for line in reader]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        executor.shutdown()
+        return replies
+
+    replies = asyncio.run(main())
+    assert len(replies) == 6
+    answers = {reply['id']: reply for reply in replies if reply['id'] is not None}
+    errors = sorted(reply['error'] for reply in replies if reply['id'] is None)
+    assert answers[1] == {'id': 1, 'result': [None, 0, 5]}
+    assert answers[3]['error'].startswith('KeyError')
+    assert answers[4] == {'id': 4, 'result': True}
+    assert errors[0].startswith('ValueError: Expecting value')
+    assert errors[1:] == ['ValueError: request line is too long', 'ValueError: request must be a JSON object']
+
+
+if __name__ == '__main__':
+
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name} passed')
@@ -0,0 +1,186 @@
+# Description: This program checks the spanning forest and low-link (tarjan) methods of UndirectedGraph against brute
+# force on small random graphs. Run it with python test_ud_graph.py (or with pytest).
+
+import itertools
+import random
+
+from ud_graph import UndirectedGraph
+
+NAMES = 'ABCDEFG'
+NUM_GRAPHS = 300
+
+
+def random_graph(seed, weighted=False):
+    """
+    Return a random graph with up to 7 vertices (some isolated) and up to 12 edges
+    """
+    rng = random.Random(seed)
+    names = NAMES[:rng.randint(1, len(NAMES))]
+    graph = UndirectedGraph()
+    for v in names:
+        graph.add_vertex(v)
+    for _ in range(rng.randint(0, 12)):
+        weight = rng.choice([1, 2, 3, 5, 0.5]) if weighted else 1
+        graph.add_edge(rng.choice(names), rng.choice(names), weight)
+    return graph
+
+
+def edge_list(graph):
+    """
+    Return every edge of the graph once as (u, v, weight)
+    """
+    return [(u, v, graph.get_edge_weight(u, v)) for u in graph.adj_list for v in graph.adj_list[u] if u < v]
+
+
+def brute_force_forest_weight(graph):
+    """
+    Return the smallest total weight of a set of edges that connects every component of the graph, trying every
+    set of V - C edges
+    """
+    num_comps = graph.count_connected_components()
+    best = None
+    for edges in itertools.combinations(edge_list(graph), len(graph.adj_list) - num_comps):
+        forest = UndirectedGraph()
+        for v in graph.adj_list:
+            forest.add_vertex(v)
+        for u, v, _ in edges:
+            forest.add_edge(u, v)
+        if forest.count_connected_components() == num_comps:
+            total = sum(weight for _, _, weight in edges)
+            best = total if best is None else min(best, total)
+    return 0 if best is None else best
+
+
+def check_spanning_forest(graph, forest):
+    """
+    Check that forest is a spanning forest of graph made of graph edges with their weights, and return its weight
+    """
+    tree_graph = UndirectedGraph()
+    for v in graph.adj_list:
+        tree_graph.add_vertex(v)
+    for u, v, weight in forest:
+        assert graph.get_edge_weight(u, v) == weight
+        tree_graph.add_edge(u, v)
+    assert len(forest) == len(graph.adj_list) - graph.count_connected_components()
+    assert tree_graph.count_connected_components() == graph.count_connected_components()
+    return sum(weight for _, _, weight in forest)
+
+
+def test_kruskal_and_prim_are_minimum():
+    for seed in range(NUM_GRAPHS):
+        graph = random_graph(seed, weighted=True)
+        best = brute_force_forest_weight(graph)
+        for method in (graph.kruskal, graph.prim):
+            assert abs(check_spanning_forest(graph, method()) - best) < 1e-9, (seed, method.__name__)
+
+
+def test_weights_follow_edges():
+    graph = UndirectedGraph()
+    graph.add_edge('A', 'B', 4)
+    graph.add_edge('B', 'C')
+    graph.add_edge('C', 'D', -1)
+    assert graph.get_edge_weight('B', 'A') == 4
+    assert graph.get_edge_weight('B', 'C') == 1
+    assert graph.get_edge_weight('C', 'D') is None
+    assert graph.copy_graph().get_edge_weight('A', 'B') == 4
+    graph.remove_edge('A', 'B')
+    graph.add_edge('A', 'B')
+    assert graph.get_edge_weight('A', 'B') == 1
+    graph.add_edge('A', 'D', 7)
+    graph.remove_vertex('D')
+    graph.add_edge('A', 'D')
+    assert graph.get_edge_weight('D', 'A') == 1
+
+    # like DirectedGraph, a weight of 0 is no edge and adding an existing edge again sets its weight
+    graph.add_edge('C', 'E', 0)
+    assert graph.get_edge_weight('C', 'E') is None
+    graph.add_edge('D', 'A', 2.5)
+    assert graph.get_edge_weight('A', 'D') == 2.5
+    graph.add_edge('A', 'D')
+    assert graph.get_edge_weight('A', 'D') == 1
+    assert len(graph.get_edges()) == 3
+
+    # snapshots keep the weights
+    graph.add_edge('B', 'C', 6)
+    snapshot = graph.freeze()
+    for u, v, weight in edge_list(graph):
+        assert snapshot.get_edge_weight(u, v) == snapshot.get_edge_weight(v, u) == weight
+    assert snapshot.get_edge_weight('C', 'E') is None
+
+
+def simple_cycles(graph):
+    """
+    Return every simple cycle of the graph (3 or more vertices) as a frozenset of frozenset edges
+    """
+    cycles = set()
+
+    def extend(path, edges):
+        for v in graph.adj_list[path[-1]]:
+            if v == path[0] and len(path) > 2:
+                cycles.add(frozenset(edges | {frozenset((path[-1], v))}))
+            elif v not in path and v > path[0]:
+                extend(path + [v], edges | {frozenset((path[-1], v))})
+
+    # every cycle is found from its smallest vertex
+    for start in graph.adj_list:
+        extend([start], frozenset())
+    return cycles
+
+
+def brute_force_blocks(graph):
+    """
+    Return the biconnected components of the graph as a set of frozenset vertex sets: two edges are in the same
+    component when they are on a common simple cycle
+    """
+    block_of = {frozenset((u, v)): {frozenset((u, v))} for u, v, _ in edge_list(graph)}
+    for cycle in simple_cycles(graph):
+        merged = set().union(*(block_of[edge] for edge in cycle))
+        for edge in merged:
+            block_of[edge] = merged
+    return {frozenset().union(*block) for block in map(frozenset, block_of.values())}
+
+
+def test_tarjan_matches_brute_force():
+    for seed in range(NUM_GRAPHS):
+        graph = random_graph(seed)
+        bridges, points, components = graph.tarjan()
+        num_comps = graph.count_connected_components()
+
+        # a bridge is an edge whose removal adds a component
+        expected_bridges = set()
+        for u, v, _ in edge_list(graph):
+            copy_graph = graph.copy_graph()
+            copy_graph.remove_edge(u, v)
+            if copy_graph.count_connected_components() > num_comps:
+                expected_bridges.add(frozenset((u, v)))
+        assert set(map(frozenset, bridges)) == expected_bridges, seed
+        assert len(bridges) == len(expected_bridges), seed
+
+        # an articulation point is a vertex with edges whose removal adds a component
+        expected_points = set()
+        for v in graph.adj_list:
+            copy_graph = graph.copy_graph()
+            copy_graph.remove_vertex(v)
+            if graph.adj_list[v] and copy_graph.count_connected_components() > num_comps:
+                expected_points.add(v)
+        assert set(points) == expected_points, seed
+        assert len(points) == len(expected_points), seed
+
+        assert {frozenset(comp) for comp in components} == brute_force_blocks(graph), seed
+        assert len(components) == len(brute_force_blocks(graph)), seed
+
+
+def test_has_cycle_matches_brute_force():
+    for seed in range(NUM_GRAPHS):
+        graph = random_graph(seed)
+        # a forest has exactly one edge less than vertices in each component
+        expected = len(edge_list(graph)) > len(graph.adj_list) - graph.count_connected_components()
+        assert graph.has_cycle() == expected == bool(simple_cycles(graph)), seed
+
+
+if __name__ == '__main__':
+
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name} passed')
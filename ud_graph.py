@@ -6,7 +6,9 @@
 # add edge, get edges, perform BFS/DFS, etc.)
 
 import heapq
+from array import array
 from collections import deque
+from types import MappingProxyType
 import random
 
 class UndirectedGraph:
@@ -14,10 +16,17 @@ class UndirectedGraph:
     Class to implement undirected graph
     - duplicate edges not allowed
     - loops not allowed
-    - no edge weights
+    - optional positive edge weights (default 1), set with add_edge() (adding an existing edge again sets its weight)
     - vertex names are strings
     """
 
+    # GraphProbe collecting instrumentation from this graph, set by GraphProbe.attach() (see graph_probe)
+    _probe = None
+
+    # weights of the edges that do not have the default weight of 1, stored at both vertices as
+    # {u: {v: weight}}. Created by the first add_edge() call with another weight, so unweighted graphs never pay for it
+    adj_weights = None
+
     def __init__(self, start_edges=None):
         """
         Store graph info as adjacency list
@@ -58,14 +67,16 @@ class UndirectedGraph:
         if v not in self.adj_list:
             self.adj_list[v] = []
         
-    def add_edge(self, u: str, v: str) -> None:
+    def add_edge(self, u: str, v: str, weight=1) -> None:
         """
-        This method adds a new edge to the graph between the two input vertices, u and v. If either of the
-        vertices are not in the graph before this method is called, this method adds the vertices and the edge.
-        If the edge already exists, the method does nothing. No return value.
+        This method adds a new edge to the graph between the two input vertices, u and v, with the input weight
+        (defaults to 1). If either of the vertices are not in the graph before this method is called, this method
+        adds the vertices and the edge. If the edge already exists, its weight is updated to the input weight. If the
+        weight is not positive (like DirectedGraph, where a weight of 0 means no edge), the method does nothing. No
+        return value.
         """
-        # check to see if u and v are the same, if they are end the function (no loops)
-        if u == v:
+        # check to see if u and v are the same or the weight is not positive, if they are end the function (no loops)
+        if u == v or weight <= 0:
             return
 
         # check to see if u and v are in adj list dictionary, if they're not add them
@@ -77,9 +88,18 @@ class UndirectedGraph:
         # then check to see if edge exists between them, if not add the edge
         if v not in self.adj_list[u]:
             self.adj_list[u].append(v)
-        if u not in self.adj_list[v]:
             self.adj_list[v].append(u)
 
+        # only store the weight if it is not the default, an existing edge set back to 1 loses its stored weight
+        if weight != 1:
+            if self.adj_weights is None:
+                self.adj_weights = dict()
+            self.adj_weights.setdefault(u, dict())[v] = weight
+            self.adj_weights.setdefault(v, dict())[u] = weight
+        elif self.adj_weights is not None and v in self.adj_weights.get(u, ()):
+            del self.adj_weights[u][v]
+            del self.adj_weights[v][u]
+
     def remove_edge(self, v: str, u: str) -> None:
         """
         This method removes the edge between the input vertices from the graph. If either of the vertices
@@ -97,6 +117,11 @@ class UndirectedGraph:
         self.adj_list[u].remove(v)
         self.adj_list[v].remove(u)
 
+        # remove the weight of the edge if it had one
+        if self.adj_weights is not None and v in self.adj_weights.get(u, ()):
+            del self.adj_weights[u][v]
+            del self.adj_weights[v][u]
+
     def remove_vertex(self, v: str) -> None:
         """
         This method removes the input vertex and all connected edges. If the vertex does not exist, the
@@ -114,6 +139,8 @@ class UndirectedGraph:
 
         # remove v from the dictionary
         del self.adj_list[v]
+        if self.adj_weights is not None:
+            self.adj_weights.pop(v, None)
 
     def get_vertices(self) -> []:
         """
@@ -126,6 +153,16 @@ class UndirectedGraph:
 
         return return_list
 
+    def get_edge_weight(self, u: str, v: str):
+        """
+        This method returns the weight of the edge between the input vertices, or None if there is no such edge.
+        """
+        if u not in self.adj_list or v not in self.adj_list[u]:
+            return None
+        if self.adj_weights is None:
+            return 1
+        return self.adj_weights.get(u, {}).get(v, 1)
+
     def get_edges(self) -> []:
         """
         This method returns a list of edges in the graph (any order).
@@ -183,11 +220,13 @@ class UndirectedGraph:
 
         # add starting vertex to list of next vertices
         next_verts.append(v_start)
+        pushes, pops, scanned = 1, 0, 0
 
         # while next vertices is not empty:
         while next_verts:
             # remove the top vertex from the stack
             curr_vert = next_verts.pop()
+            pops += 1
 
             # check to see if the curr_vertex is in the list of visited vertices
             if curr_vert not in visited_verts:
@@ -196,9 +235,10 @@ class UndirectedGraph:
 
                 # check to make sure curr_vertex is not the ending vertex
                 if curr_vert == v_end:
-                    return visited_verts
+                    break
 
                 # loop through adjacent vertices, adding them to a heap of adjacent vertices
+                scanned += len(self.adj_list[curr_vert])
                 adj_verts = []
                 for adj_vert in self.adj_list[curr_vert]:
                     # if adjacent vertex isn't in visited vertices, add it to the list of adjacent verts
@@ -214,7 +254,11 @@ class UndirectedGraph:
                 # loop from the back of the sorted list forward so that smallest vertex is on top of stack
                 for _ in range(heap_length - 1, -1, -1):
                     next_verts.append(sorted_list.pop())
+                pushes += heap_length
 
+        if self._probe is not None:
+            self._probe.count('dfs', vertices_settled=len(visited_verts), edges_scanned=scanned, pushes=pushes,
+                              pops=pops, stale_entries=pops - len(visited_verts))
         return visited_verts
 
     def bfs(self, v_start, v_end=None) -> []:
@@ -233,6 +277,8 @@ class UndirectedGraph:
         if v_start not in self.adj_list:
             return visited_verts
 
+        pushes, scanned = 1, 0
+
         # loop until the queue is empty
         while queue:
             # dequeue the first vertex in the queue
@@ -241,9 +287,10 @@ class UndirectedGraph:
             # add the vertex to the list of visited verts
             visited_verts.append(curr_vert)
 
-            # check to see if current vertex is the ending vertex, if it is end the function
+            # check to see if current vertex is the ending vertex, if it is end the search
             if curr_vert == v_end:
-                return visited_verts
+                break
+            scanned += len(self.adj_list[curr_vert])
 
             # add all of the curr_vert's neighbors to the next_verts, but in ascending order
             # create new adj_heap, add neighbors to it, then enqueue them from start to end to queue
@@ -254,6 +301,12 @@ class UndirectedGraph:
                 vert = heapq.heappop(adj_heap)
                 if vert not in visited_verts and vert not in queue:
                     queue.append(vert)
+                    pushes += 1
+
+        # a vertex is never queued twice, so every pop settles a vertex
+        if self._probe is not None:
+            self._probe.count('bfs', vertices_settled=len(visited_verts), edges_scanned=scanned, pushes=pushes,
+                              pops=len(visited_verts), stale_entries=0)
         return visited_verts
 
     def count_connected_components(self):
@@ -293,31 +346,106 @@ class UndirectedGraph:
         """
         This method returns True if the graph contains a cycle, False otherwise.
         """
-        # a graph has a cycle if you can remove an edge and still have the same number of components
-        # copy the graph so that we can remove edges and not ruin the original graph
-        copy_graph = self.copy_graph()
-        # find number of components to start
-        num_comps = copy_graph.count_connected_components()
-
-        # loop through the vertices
-        for v in copy_graph.adj_list:
-            # check to see if the length of edges is more than 1, if it's not it can't be part of a cycle
-            # so skip to next vertex
-            num_edges = len(copy_graph.adj_list[v])
-            if num_edges > 1:
-                # for each edge, remove it and see how many components you have left
-                while copy_graph.adj_list[v]:
-                    u = copy_graph.adj_list[v][0]
-                    copy_graph.remove_edge(u, v)
-                    comps_after = copy_graph.count_connected_components()
-
-                    # if number of components hasn't changed, you found a cycle so return True
-                    if num_comps == comps_after:
-                        return True
-                    # if the number has changed, it'll increase by 1, so just add 1 instead of another call to function
-                    num_comps += 1
-
-        return False
+        # an edge is on a cycle exactly when removing it does not split its component, i.e. when it is not a bridge
+        bridges = self.tarjan()[0]
+        num_edges = sum(len(adj) for adj in self.adj_list.values()) // 2
+        return len(bridges) < num_edges
+
+    def tarjan(self):
+        """
+        This method finds the bridges, articulation points and biconnected components of the graph in one
+        iterative depth first search (Tarjan's low-link algorithm) in O(V + E), and returns them as a tuple
+        (bridges, articulation_points, components). Bridges are (u, v) edges whose removal disconnects their
+        component, articulation points are vertices whose removal does, and components is a list of the
+        biconnected components given as lists of vertices (a bridge is a component of its own 2 vertices).
+        """
+        vertices = list(self.adj_list)
+        index = {v: num for num, v in enumerate(vertices)}
+        neighbors = [[index[u] for u in self.adj_list[v]] for v in vertices]
+
+        # disc is the order in which the search reaches a vertex (0 = not reached yet), low is the smallest disc
+        # reachable from the subtree of the vertex with at most one back edge
+        disc = [0] * len(vertices)
+        low = [0] * len(vertices)
+        is_point = bytearray(len(vertices))
+        bridges = []
+        components = []
+        edge_stack = []
+        timer = 0
+
+        for root in range(len(vertices)):
+            if disc[root]:
+                continue
+            timer += 1
+            disc[root] = low[root] = timer
+            root_children = 0
+            # each entry is (vertex, parent, position of the next neighbor to look at)
+            stack = [(root, -1, 0)]
+
+            while stack:
+                v, parent, pos = stack[-1]
+                if pos < len(neighbors[v]):
+                    stack[-1] = (v, parent, pos + 1)
+                    u = neighbors[v][pos]
+                    if not disc[u]:
+                        timer += 1
+                        disc[u] = low[u] = timer
+                        edge_stack.append((v, u))
+                        stack.append((u, v, 0))
+                    elif u != parent and disc[u] < disc[v]:
+                        # back edge to an ancestor
+                        low[v] = min(low[v], disc[u])
+                        edge_stack.append((v, u))
+                    continue
+
+                # all neighbors of v are done, so pass its low value up to the parent
+                stack.pop()
+                if parent == -1:
+                    continue
+                low[parent] = min(low[parent], low[v])
+                if low[v] > disc[parent]:
+                    bridges.append((vertices[parent], vertices[v]))
+                if low[v] >= disc[parent]:
+                    # nothing below v reaches above parent, so the edges since (parent, v) form a component
+                    comp = set()
+                    while True:
+                        edge = edge_stack.pop()
+                        comp.update(edge)
+                        if edge == (parent, v):
+                            break
+                    components.append([vertices[num] for num in sorted(comp)])
+                    if parent == root:
+                        root_children += 1
+                    else:
+                        is_point[parent] = 1
+
+            # the root of the search only separates the graph if it has more than one child
+            if root_children > 1:
+                is_point[root] = 1
+
+        articulation_points = [vertices[num] for num in range(len(vertices)) if is_point[num]]
+        return bridges, articulation_points, components
+
+    def get_bridges(self) -> []:
+        """
+        This method returns a list of the bridges of the graph, the (u, v) edges whose removal disconnects
+        their component.
+        """
+        return self.tarjan()[0]
+
+    def get_articulation_points(self) -> []:
+        """
+        This method returns a list of the articulation points of the graph, the vertices whose removal
+        disconnects their component.
+        """
+        return self.tarjan()[1]
+
+    def get_biconnected_components(self) -> []:
+        """
+        This method returns a list of the biconnected components of the graph. The components are a list of
+        vertices in that component.
+        """
+        return self.tarjan()[2]
 
     def copy_graph(self):
         """
@@ -328,8 +456,432 @@ class UndirectedGraph:
             copy_graph.add_vertex(v)
             for u in self.adj_list[v]:
                 copy_graph.adj_list[v].append(u)
+        if self.adj_weights is not None:
+            copy_graph.adj_weights = {v: dict(weights) for v, weights in self.adj_weights.items()}
         return copy_graph
 
+    def _weighted_index(self):
+        """
+        Number the vertices in insertion order and return (vertices, neighbors) where neighbors[i] is a list of
+        (neighbor number, weight) tuples for the vertex numbered i
+        """
+        vertices = list(self.adj_list)
+        index = {v: num for num, v in enumerate(vertices)}
+        weights = self.adj_weights or {}
+        neighbors = []
+        for v in vertices:
+            v_weights = weights.get(v, {})
+            neighbors.append([(index[u], v_weights.get(u, 1)) for u in self.adj_list[v]])
+        return vertices, neighbors
+
+    def kruskal(self) -> []:
+        """
+        This method returns a minimum spanning forest of the graph (one minimum spanning tree per connected
+        component) as a list of (u, v, weight) edges, computed with Kruskal's algorithm. The edges are sorted by
+        weight and joined with a union-find index, so the method runs in O(E log V).
+        """
+        vertices, neighbors = self._weighted_index()
+
+        # every edge is stored at both vertices, only keep it from the lower numbered one
+        edges = []
+        for num, adj in enumerate(neighbors):
+            for adj_num, weight in adj:
+                if num < adj_num:
+                    edges.append((weight, num, adj_num))
+        edges.sort()
+
+        forest = []
+        components = _UnionFind(len(vertices))
+        for weight, u, v in edges:
+            # an edge belongs to the forest if it joins two trees that are not joined yet
+            if components.union(u, v):
+                forest.append((vertices[u], vertices[v], weight))
+                if len(forest) == len(vertices) - 1:
+                    break
+        return forest
+
+    def prim(self) -> []:
+        """
+        This method returns a minimum spanning forest of the graph (one minimum spanning tree per connected
+        component) as a list of (u, v, weight) edges, computed with Prim's algorithm. Each tree is grown from the
+        first vertex of its component that was added to the graph, using an indexed heap that lowers the key of a
+        vertex in place, so the method runs in O(E log V).
+        """
+        vertices, neighbors = self._weighted_index()
+        num_verts = len(vertices)
+        in_tree = bytearray(num_verts)
+        parent = [-1] * num_verts
+        heap = _IndexedHeap(num_verts)
+        forest = []
+
+        # start a new tree at every vertex that is not in a tree yet, so every connected component gets one
+        for root in range(num_verts):
+            if in_tree[root]:
+                continue
+            heap.push(root, 0)
+            while heap:
+                weight, u = heap.pop()
+                in_tree[u] = 1
+                if parent[u] != -1:
+                    forest.append((vertices[parent[u]], vertices[u], weight))
+                # lower the key of every neighbor outside the tree that is closer through u
+                for v, edge_weight in neighbors[u]:
+                    if not in_tree[v] and heap.push(v, edge_weight):
+                        parent[v] = u
+        return forest
+
+    def freeze(self):
+        """
+        This method returns an immutable snapshot of the graph as a FrozenUndirectedGraph. The snapshot does not
+        share any storage with the graph, so the graph can keep being modified while other threads query the
+        snapshot without locks. Call this method from the thread that modifies the graph and publish the result by
+        assigning it to a shared variable (a single assignment is atomic, so readers see either the old or the new
+        snapshot).
+        """
+        return FrozenUndirectedGraph(self)
+
+
+class _UnionFind:
+    """
+    Disjoint sets of the integers 0 to size - 1 with union by size and path halving
+    """
+
+    __slots__ = ('parent', 'size')
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item):
+        """
+        Return the representative of the set holding item
+        """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first, second):
+        """
+        Join the sets holding first and second. Returns False if they were already in the same set.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return True
+
+
+class _IndexedHeap:
+    """
+    Binary min heap of the integers 0 to size - 1 keyed by a number, with the position of every item kept in an
+    index so that the key of an item already in the heap can be lowered in place
+    """
+
+    __slots__ = ('items', 'keys', 'pos')
+
+    def __init__(self, size):
+        self.items = []
+        self.keys = [0] * size
+        self.pos = [-1] * size
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, item, key):
+        """
+        Add item with the input key, or lower its key if it is already in the heap. Returns True if the heap
+        changed, False if the item was already in the heap with a key no larger than the input key.
+        """
+        pos = self.pos[item]
+        if pos == -1:
+            pos = len(self.items)
+            self.items.append(item)
+            self.pos[item] = pos
+        elif key >= self.keys[item]:
+            return False
+        self.keys[item] = key
+        self._sift_up(pos)
+        return True
+
+    def pop(self):
+        """
+        Remove the item with the smallest key and return (key, item)
+        """
+        items, pos = self.items, self.pos
+        top = items[0]
+        last = items.pop()
+        pos[top] = -1
+        if items:
+            items[0] = last
+            pos[last] = 0
+            self._sift_down(0)
+        return self.keys[top], top
+
+    def _sift_up(self, index):
+        items, keys, pos = self.items, self.keys, self.pos
+        item = items[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if keys[items[parent]] <= keys[item]:
+                break
+            items[index] = items[parent]
+            pos[items[index]] = index
+            index = parent
+        items[index] = item
+        pos[item] = index
+
+    def _sift_down(self, index):
+        items, keys, pos = self.items, self.keys, self.pos
+        item = items[index]
+        size = len(items)
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[items[child + 1]] < keys[items[child]]:
+                child += 1
+            if keys[item] <= keys[items[child]]:
+                break
+            items[index] = items[child]
+            pos[items[index]] = index
+            index = child
+        items[index] = item
+        pos[item] = index
+
+
+class FrozenUndirectedGraph:
+    """
+    Class to implement an immutable snapshot of an UndirectedGraph
+    - created with UndirectedGraph.freeze()
+    - vertices numbered in insertion order, adjacency stored as compressed rows in read-only arrays
+    - edge weights kept next to the adjacency (weights is None if every edge has the default weight of 1)
+    - attributes cannot be reassigned after construction
+    - vertex names are strings
+    """
+
+    __slots__ = ('vertices', 'index', 'offsets', 'targets', 'weights')
+
+    def __init__(self, graph):
+        """
+        Build the compressed rows from the adjacency list of the input UndirectedGraph. The neighbors of the vertex
+        numbered i are stored at positions offsets[i] to offsets[i + 1] of targets as vertex numbers, sorted by
+        vertex name so that searches can visit them in ascending order without sorting. If the graph has edges with
+        a weight other than 1, the weight of each edge is stored at the same positions of weights, in an array when
+        the weights are all integers, otherwise as the weight objects in a tuple.
+        """
+        vertices = tuple(graph.adj_list)
+        index = {v: num for num, v in enumerate(vertices)}
+        offsets = array('q', [0])
+        targets = array('q')
+        adj_weights = graph.adj_weights if graph.adj_weights and any(graph.adj_weights.values()) else None
+        weight_list = []
+
+        for v in vertices:
+            v_weights = adj_weights.get(v, {}) if adj_weights is not None else None
+            for u in sorted(graph.adj_list[v]):
+                targets.append(index[u])
+                if v_weights is not None:
+                    weight_list.append(v_weights.get(u, 1))
+            offsets.append(len(targets))
+
+        # unweighted graphs keep no weights at all, like the adj_weights of the graph
+        weights = None
+        if adj_weights is not None:
+            weights = tuple(weight_list)
+            if all(type(weight) is int for weight in weight_list):
+                try:
+                    weights = memoryview(array('q', weight_list)).toreadonly()
+                except OverflowError:
+                    pass
+
+        object.__setattr__(self, 'vertices', vertices)
+        object.__setattr__(self, 'index', MappingProxyType(index))
+        object.__setattr__(self, 'offsets', memoryview(offsets).toreadonly())
+        object.__setattr__(self, 'targets', memoryview(targets).toreadonly())
+        object.__setattr__(self, 'weights', weights)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenUndirectedGraph is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenUndirectedGraph is immutable')
+
+    def __reduce__(self):
+        # snapshots are sent to worker processes, so pickle the arrays behind the read-only views
+        weights = self.weights.obj if isinstance(self.weights, memoryview) else self.weights
+        return _restore_frozen_undirected, (self.vertices, self.offsets.obj, self.targets.obj, weights)
+
+    def __str__(self):
+        """
+        Return content of the snapshot in human-readable form
+        """
+        return f"FROZEN GRAPH ({len(self.vertices)} vertices, {len(self.targets) // 2} edges)"
+
+    # ------------------------------------------------------------------ #
+
+    def get_vertices(self) -> []:
+        """
+        This method returns a list of vertices in the snapshot (insertion order of the graph).
+        """
+        return list(self.vertices)
+
+    def get_edges(self) -> []:
+        """
+        This method returns a list of edges in the snapshot (any order).
+        """
+        edge_list = []
+        vertices, offsets, targets = self.vertices, self.offsets, self.targets
+        for num in range(len(vertices)):
+            for pos in range(offsets[num], offsets[num + 1]):
+                # each edge is stored at both of its vertices, only report it from the lower numbered one
+                if num < targets[pos]:
+                    edge_list.append((vertices[num], vertices[targets[pos]]))
+        return edge_list
+
+    def has_edge(self, u: str, v: str) -> bool:
+        """
+        This method returns True if there is an edge between u and v, otherwise False.
+        """
+        if u not in self.index or v not in self.index:
+            return False
+        num, target = self.index[u], self.index[v]
+        return target in self.targets[self.offsets[num]:self.offsets[num + 1]]
+
+    def get_edge_weight(self, u: str, v: str):
+        """
+        This method returns the weight of the edge between the input vertices, or None if there is no such edge.
+        """
+        if u not in self.index or v not in self.index:
+            return None
+        num, target = self.index[u], self.index[v]
+        for pos in range(self.offsets[num], self.offsets[num + 1]):
+            if self.targets[pos] == target:
+                return 1 if self.weights is None else self.weights[pos]
+        return None
+
+    def is_valid_path(self, path: []) -> bool:
+        """
+        This method takes a list of vertex names as input and returns True if the path is valid (i.e. can travel
+        over vertices input by edges), otherwise False. An empty path returns True.
+        """
+        if len(path) == 1:
+            return path[0] in self.index
+
+        for index in range(len(path) - 1):
+            if not self.has_edge(path[index], path[index + 1]):
+                return False
+        return True
+
+    def dfs(self, v_start, v_end=None) -> []:
+        """
+        This method performs a depth first search on the snapshot and returns a list of visited vertices, visiting
+        adjacent vertices in ascending order. Same inputs and results as UndirectedGraph.dfs().
+        """
+        visited_verts = []
+        if v_start not in self.index:
+            return visited_verts
+
+        vertices, offsets, targets = self.vertices, self.offsets, self.targets
+        visited = bytearray(len(vertices))
+        next_verts = [self.index[v_start]]
+
+        while next_verts:
+            curr = next_verts.pop()
+            if visited[curr]:
+                continue
+            visited[curr] = 1
+            visited_verts.append(vertices[curr])
+
+            if vertices[curr] == v_end:
+                return visited_verts
+
+            # push the unvisited neighbors from the back so that the smallest one is on top of the stack
+            for pos in range(offsets[curr + 1] - 1, offsets[curr] - 1, -1):
+                if not visited[targets[pos]]:
+                    next_verts.append(targets[pos])
+
+        return visited_verts
+
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        This method performs a breadth first search on the snapshot and returns a list of visited vertices, visiting
+        adjacent vertices in ascending order. Same inputs and results as UndirectedGraph.bfs().
+        """
+        visited_verts = []
+        if v_start not in self.index:
+            return visited_verts
+
+        vertices, offsets, targets = self.vertices, self.offsets, self.targets
+        # a vertex is marked as soon as it is queued, so it is never queued twice
+        seen = bytearray(len(vertices))
+        start = self.index[v_start]
+        seen[start] = 1
+        queue = deque()
+        queue.append(start)
+
+        while queue:
+            curr = queue.popleft()
+            visited_verts.append(vertices[curr])
+
+            if vertices[curr] == v_end:
+                return visited_verts
+
+            for pos in range(offsets[curr], offsets[curr + 1]):
+                adj = targets[pos]
+                if not seen[adj]:
+                    seen[adj] = 1
+                    queue.append(adj)
+        return visited_verts
+
+    def count_connected_components(self):
+        """
+        This method returns the number of connected components in the snapshot.
+        """
+        return len(self.get_connected_components())
+
+    def get_connected_components(self):
+        """
+        This method returns a list of the connected components in the snapshot. The connected components are a list
+        of vertices in that component.
+        """
+        components = []
+        seen = set()
+        for vert in self.vertices:
+            if vert not in seen:
+                comp = self.bfs(vert)
+                seen.update(comp)
+                components.append(comp)
+        return components
+
+    def has_cycle(self):
+        """
+        This method returns True if the snapshot contains a cycle, False otherwise.
+        """
+        # a graph without cycles is a forest, and a forest has exactly one edge less than vertices per component
+        num_edges = len(self.targets) // 2
+        return num_edges > len(self.vertices) - self.count_connected_components()
+
+
+def _restore_frozen_undirected(vertices, offsets, targets, weights):
+    """
+    Rebuild a FrozenUndirectedGraph from its vertex names and arrays (used when unpickling)
+    """
+    snapshot = object.__new__(FrozenUndirectedGraph)
+    object.__setattr__(snapshot, 'vertices', vertices)
+    object.__setattr__(snapshot, 'index', MappingProxyType({v: num for num, v in enumerate(vertices)}))
+    object.__setattr__(snapshot, 'offsets', memoryview(offsets).toreadonly())
+    object.__setattr__(snapshot, 'targets', memoryview(targets).toreadonly())
+    if isinstance(weights, array):
+        weights = memoryview(weights).toreadonly()
+    object.__setattr__(snapshot, 'weights', weights)
+    return snapshot
+
+
 if __name__ == '__main__':
 
     print("\nPDF - method add_vertex() / add_edge example 1")
@@ -421,3 +973,35 @@ if __name__ == '__main__':
         u, v = edge
         g.add_edge(u, v) if command == 'add' else g.remove_edge(u, v)
         print('{:<10}'.format(case), g.has_cycle())
+
+
+    print("\nmethod freeze() example 1")
+    print("-------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = UndirectedGraph(edges)
+    snapshot = g.freeze()
+    g.remove_vertex('E')
+    print(snapshot)
+    print(f'GRAPH    BFS:{g.bfs("A")} {g.has_cycle()}')
+    print(f'SNAPSHOT BFS:{snapshot.bfs("A")} {snapshot.has_cycle()}')
+
+
+    print("\nmethod kruskal() / prim() example 1")
+    print("-----------------------------------")
+    g = UndirectedGraph()
+    edges = [('A', 'B', 4), ('A', 'C', 1), ('B', 'C', 2), ('B', 'D', 5), ('C', 'D', 8), ('D', 'E', 3),
+             ('F', 'G', 6), ('G', 'H', 1), ('F', 'H', 2)]
+    for u, v, weight in edges:
+        g.add_edge(u, v, weight)
+    print(f'KRUSKAL {g.kruskal()}')
+    print(f'PRIM    {g.prim()}')
+
+
+    print("\nmethod tarjan() example 1")
+    print("-------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = UndirectedGraph(edges)
+    bridges, points, components = g.tarjan()
+    print(f'BRIDGES {bridges}')
+    print(f'ARTICULATION POINTS {points}')
+    print(f'BICONNECTED COMPONENTS {components}')